@@ -5,13 +5,23 @@
 
 import os
 import time
-from typing import List, Optional
-from moviepy import AudioFileClip, ImageClip, CompositeVideoClip
+import subprocess
+import tempfile
+from functools import lru_cache
+try:
+    import fcntl
+except ImportError:  # Windows没有fcntl
+    fcntl = None
+from typing import List, Optional, Tuple
+from moviepy import AudioFileClip, ImageClip
+from moviepy.config import FFMPEG_BINARY
 from PIL import Image, ImageFilter, ImageEnhance
 import numpy as np
+import cv2
 import traceback
 from pathlib import Path
 from lrc_mv_config import load_lrc_mv_config
+from video_encoders import DRAFT_ENCODERS, DEFAULT_DRAFT_ENCODER
 
 # 导入LyricTimeline相关类
 from lyric_timeline import LyricTimeline, LyricDisplayMode
@@ -22,13 +32,50 @@ DEFAULT_WIDTH = 720
 DEFAULT_HEIGHT = 1280
 DEFAULT_FPS = 24
 
+
+@lru_cache(maxsize=None)
+def _ffmpeg_encoders() -> str:
+    """获取ffmpeg支持的编码器列表（只探测一次）；探测失败时返回空字符串"""
+    try:
+        result = subprocess.run([FFMPEG_BINARY, '-hide_banner', '-encoders'],
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def _enlarge_pipe_buffer(fd: int, size: int = 1 << 20):
+    """尽量增大管道缓冲区（仅Linux支持，默认64KB），减少写入整帧数据时的阻塞次数"""
+    if fcntl is None or not hasattr(fcntl, 'F_SETPIPE_SZ'):
+        return
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, size)
+    except OSError:
+        pass  # 超过系统上限（/proc/sys/fs/pipe-max-size）时保持默认大小
+
+
+def is_encoder_available(codec: str) -> bool:
+    """检查当前ffmpeg是否编译了指定的编码器"""
+    return any(line.split()[1:2] == [codec] for line in _ffmpeg_encoders().splitlines())
+
+
 class EnhancedJingwuGenerator:
     """增强版精武英雄歌词视频生成器（重构修复终版）"""
 
-    def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, fps: int = DEFAULT_FPS):
+    def __init__(self, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, fps: int = DEFAULT_FPS,
+                 workers: Optional[int] = None, encoder: str = DEFAULT_DRAFT_ENCODER):
         self.width = width
         self.height = height
         self.fps = fps
+        # 草稿模式使用的编码器（DRAFT_ENCODERS中的名称）
+        if encoder not in DRAFT_ENCODERS:
+            raise ValueError(f"不支持的编码器: {encoder}")
+        self.encoder = encoder
+        # 渲染帧的工作进程数，None表示使用全部CPU核心，1表示在主进程中逐帧渲染
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        # 输出视频尺寸 (width, height)，None表示与渲染尺寸相同；
+        # 不同时按渲染尺寸合成帧，由ffmpeg在编码时缩放到输出尺寸
+        self.output_size: Optional[Tuple[int, int]] = None
         self.default_font_size = 80
         self.default_font_color = 'white'
         self.highlight_color = '#FFD700'  # 金色
@@ -48,26 +95,52 @@ class EnhancedJingwuGenerator:
 
 
     def load_background_image(self, bg_path: str) -> Optional[np.ndarray]:
-        """加载并处理背景图片"""
+        """加载并处理背景图片（优先使用OpenCV，无法解码时回退到PIL）"""
         try:
-            img = Image.open(bg_path)
-            # PIL版本兼容性处理
-            try:
-                img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-            except AttributeError:
-                # 较旧的PIL版本回退
-                img = img.resize((self.width, self.height))
-
-            enhancer = ImageEnhance.Brightness(img)
-            img = enhancer.enhance(0.4)
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(0.6)
-            img = img.filter(ImageFilter.GaussianBlur(radius=1))
-            return np.array(img)
+            img = self._load_background_image_cv2(bg_path)
+            if img is None:
+                img = self._load_background_image_pil(bg_path)
+            return img
         except Exception as e:
             print(f"⚠️  背景图片加载失败: {e}")
             return None
 
+    def _load_background_image_cv2(self, bg_path: str) -> Optional[np.ndarray]:
+        """使用OpenCV缩放、调暗、降低对比度并模糊背景，返回连续的RGB数组；无法解码时返回None"""
+        # 经np.fromfile读取再解码，支持包含中文的路径（cv2.imread在Windows上不支持）
+        data = np.fromfile(bg_path, dtype=np.uint8)
+        bgr = cv2.imdecode(data, cv2.IMREAD_COLOR)
+        if bgr is None:
+            return None
+
+        img = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        img = cv2.resize(img, (self.width, self.height), interpolation=cv2.INTER_LANCZOS4)
+
+        # 亮度0.4：整体缩放
+        img = cv2.convertScaleAbs(img, alpha=0.4)
+        # 对比度0.6：向灰度均值收拢（与PIL ImageEnhance.Contrast一致）
+        mean = int(cv2.cvtColor(img, cv2.COLOR_RGB2GRAY).mean() + 0.5)
+        img = cv2.addWeighted(img, 0.6, img, 0, mean * 0.4)
+        img = cv2.GaussianBlur(img, (0, 0), 1)
+        return np.ascontiguousarray(img)
+
+    def _load_background_image_pil(self, bg_path: str) -> np.ndarray:
+        """使用PIL处理背景图片（OpenCV无法解码时的回退）"""
+        img = Image.open(bg_path)
+        # PIL版本兼容性处理
+        try:
+            img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
+        except AttributeError:
+            # 较旧的PIL版本回退
+            img = img.resize((self.width, self.height))
+
+        enhancer = ImageEnhance.Brightness(img)
+        img = enhancer.enhance(0.4)
+        enhancer = ImageEnhance.Contrast(img)
+        img = enhancer.enhance(0.6)
+        img = img.filter(ImageFilter.GaussianBlur(radius=1))
+        return np.array(img)
+
     def create_gradient_background(self, color1: tuple, color2: tuple) -> np.ndarray:
         """创建渐变背景"""
         gradient = np.zeros((self.height, self.width, 3), dtype=np.uint8)
@@ -119,7 +192,8 @@ class EnhancedJingwuGenerator:
 
     def _generate_video_with_lyric_clip(self, lyric_clip: LyricClip,
                                        audio_clip,
-                                       output_path: str, draft_mode: bool = False):
+                                       output_path: str, draft_mode: bool = False,
+                                       audio_path: Optional[str] = None):
         """使用LyricClip的视频生成方法（背景已集成到LyricClip中）
 
         Args:
@@ -127,6 +201,7 @@ class EnhancedJingwuGenerator:
             audio_clip: 音频片段
             output_path: 输出路径
             draft_mode: 草稿模式
+            audio_path: 音频源文件路径（可选，提供时由ffmpeg直接截取音频）
         """
         print("使用LyricClip合成视频...")
 
@@ -137,7 +212,8 @@ class EnhancedJingwuGenerator:
             audio_clip=audio_clip,
             output_path=output_path,
             temp_audio_file_suffix="lyric_clip",
-            draft_mode=draft_mode
+            draft_mode=draft_mode,
+            audio_path=audio_path
         )
 
     def _apply_layout_to_timeline(self, timeline: 'LyricTimeline', target_rect):
@@ -152,7 +228,7 @@ class EnhancedJingwuGenerator:
             timeline.set_display_mode(
                 LyricDisplayMode.SIMPLE_FADE,
                 y_position=target_rect.y + target_rect.height // 2,
-                is_highlighted=getattr(timeline._strategy, 'is_highlighted', False)
+                is_highlighted=getattr(timeline.strategy, 'is_highlighted', False)
             )
         elif timeline.display_mode == LyricDisplayMode.ENHANCED_PREVIEW:
             # 对于增强预览模式，调整偏移量
@@ -231,21 +307,25 @@ class EnhancedJingwuGenerator:
         output_path: str,
         temp_audio_file_suffix: str = "generic",
         ffmpeg_params_custom: Optional[List[str]] = None,
-        draft_mode: bool = False
+        draft_mode: bool = False,
+        audio_path: Optional[str] = None
     ):
-        """(Helper) 合成所有片段并导出视频。
+        """(Helper) 为LyricClip附加音频并导出视频。
+
+        所有时间轴已在LyricClip的单一frame_function中合成，
+        这里不再构建CompositeVideoClip。
 
         Args:
-            all_clips: 所有视频片段
+            lyric_clip: 已包含背景和全部歌词的LyricClip
             audio_clip: 音频片段
             output_path: 输出路径
             temp_audio_file_suffix: 临时音频文件后缀
             ffmpeg_params_custom: 自定义FFmpeg参数
             draft_mode: 草稿模式，使用快速编码设置
+            audio_path: 音频源文件路径（可选，提供时由ffmpeg直接截取音频）
         """
         print("合成视频...")
         final_video:LyricClip = lyric_clip
-        # final_video = CompositeVideoClip(all_clips)
         final_video = final_video.with_audio(audio_clip)
         # final_video = final_video.with_fps(self.fps)
 
@@ -254,9 +334,8 @@ class EnhancedJingwuGenerator:
         # 根据模式选择编码配置
         if draft_mode:
             print("   🚀 使用草稿质量配置进行快速编码...")
-            codec_to_use = 'h264_nvenc'  # 优先使用NVENC硬件编码
-            preset_to_use = 'fast'
-            actual_ffmpeg_params = ffmpeg_params_custom if ffmpeg_params_custom is not None else ['-cq', '28']
+            codec_to_use, preset_to_use, default_params = self._select_draft_encoder()
+            actual_ffmpeg_params = ffmpeg_params_custom if ffmpeg_params_custom is not None else default_params
         else:
             print("   🎬 使用产品质量配置进行编码...")
             codec_to_use = 'libx264rgb'
@@ -266,36 +345,22 @@ class EnhancedJingwuGenerator:
         print(f"导出视频到: {output_path}")
         print(f"   编码器: {codec_to_use}, 预设: {preset_to_use}, 参数: {actual_ffmpeg_params}")
 
+        if self.workers > 1:
+            print(f"   多进程渲染帧: {self.workers} 个工作进程")
+
         # 开始计时
         export_start_time = time.perf_counter()
 
         try:
-            final_video.write_videofile(
-                output_path,
-                codec=codec_to_use,
-                audio_codec='aac',
-                temp_audiofile=temp_audio_filename,
-                remove_temp=True,
-                # verbose=False,
-                logger=None,
-                preset=preset_to_use,
-                ffmpeg_params=actual_ffmpeg_params
-            )
+            self._write_video(final_video, output_path, codec_to_use, preset_to_use,
+                              actual_ffmpeg_params, temp_audio_filename, audio_path)
         except Exception as e:
-            # 草稿模式下NVENC失败时快速回退到软件编码
-            if draft_mode and codec_to_use == "h264_nvenc":
-                print(f"⚠️  NVENC编码失败 ({e})，回退到软件编码...")
-                final_video.write_videofile(
-                    output_path,
-                    codec='libx264rgb',
-                    audio_codec='aac',
-                    temp_audiofile=temp_audio_filename,
-                    remove_temp=True,
-                    # verbose=False,
-                    logger=None,
-                    preset='ultrafast',
-                    ffmpeg_params=['-crf', '28']
-                )
+            # 草稿模式下硬件编码失败时快速回退到软件编码
+            fallback_codec, fallback_preset, fallback_params = DRAFT_ENCODERS['x264']
+            if draft_mode and codec_to_use != fallback_codec:
+                print(f"⚠️  {codec_to_use}编码失败 ({e})，回退到软件编码...")
+                self._write_video(final_video, output_path, fallback_codec, fallback_preset,
+                                  fallback_params, temp_audio_filename, audio_path)
             else:
                 raise
         finally:
@@ -304,6 +369,88 @@ class EnhancedJingwuGenerator:
             export_duration = export_end_time - export_start_time
             mode_desc = "草稿模式" if draft_mode else "产品模式"
             print(f"✅ 视频导出完成 ({mode_desc}): {export_duration:.2f} 秒")
+
+    def _select_draft_encoder(self):
+        """(Helper) 选择草稿模式的编码配置，所选硬件编码器不可用时回退到x264
+
+        Returns:
+            (ffmpeg编码器, 预设, 默认参数)
+        """
+        codec, preset, params = DRAFT_ENCODERS[self.encoder]
+        if self.encoder != 'x264' and not is_encoder_available(codec):
+            print(f"   ⚠️  ffmpeg不支持编码器 {codec}，改用x264软件编码")
+            codec, preset, params = DRAFT_ENCODERS['x264']
+        return codec, preset, params
+
+    def _write_video(self, video: LyricClip, output_path: str, codec: str, preset: str,
+                     ffmpeg_params: List[str], temp_audiofile: str,
+                     audio_path: Optional[str] = None):
+        """(Helper) 编码并写出视频
+
+        帧由LyricClip直接渲染（多个工作进程时并行），原始RGB数据逐帧写入ffmpeg的标准输入，
+        不经过write_videofile逐帧的装饰器和类型转换开销
+        """
+        # 与write_videofile相同：先导出临时音频，再由ffmpeg在编码时混入；
+        # 已知音频源文件时由ffmpeg直接截取并编码，不经过Python逐块解码
+        audiofile = None
+        if video.audio is not None:
+            if audio_path:
+                self._extract_audio(audio_path, video.duration, temp_audiofile)
+            else:
+                video.audio.write_audiofile(temp_audiofile, fps=44100, codec='aac', logger=None)
+            audiofile = temp_audiofile
+
+        try:
+            width, height = video.size
+            cmd = [
+                FFMPEG_BINARY, '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-vcodec', 'rawvideo',
+                '-s', f'{width}x{height}', '-pix_fmt', 'rgb24', '-r', f'{video.fps}',
+                '-i', '-',
+            ]
+            if audiofile is not None:
+                cmd += ['-i', audiofile, '-acodec', 'copy']
+            if self.output_size is not None and tuple(self.output_size) != (width, height):
+                output_width, output_height = self.output_size
+                cmd += ['-vf', f'scale={output_width}:{output_height}:flags=bilinear']
+            cmd += ['-vcodec', codec, '-preset', preset] + list(ffmpeg_params)
+            cmd.append(output_path)
+
+            # ffmpeg的错误输出写入临时文件：写帧期间无需读取，输出较多时也不会因管道写满而互相阻塞
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr_file)
+                _enlarge_pipe_buffer(proc.stdin.fileno())
+                try:
+                    # 帧按时间顺序写入同一个ffmpeg管道（ndarray直接以缓冲区写入，不额外复制；
+                    # writelines写完即释放每一帧，不会持有共享内存帧槽位的视图）
+                    proc.stdin.writelines(video.iter_rendered_frames(max_workers=self.workers))
+                except BrokenPipeError:
+                    pass  # ffmpeg提前退出，错误信息在下面统一报告
+                except BaseException:
+                    proc.kill()  # 渲染出错或被中断：终止ffmpeg，避免其一直等待输入
+                    raise
+                finally:
+                    try:
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        pass
+                    proc.wait()
+                if proc.returncode != 0:
+                    stderr_file.seek(0)
+                    error_output = stderr_file.read().decode(errors='replace').strip()
+                    raise IOError(f"ffmpeg编码失败 ({codec}): {error_output}")
+        finally:
+            if audiofile is not None and os.path.exists(audiofile):
+                os.remove(audiofile)
+
+    @staticmethod
+    def _extract_audio(audio_path: str, duration: float, output_file: str):
+        """(Helper) 使用ffmpeg截取音频开头duration秒并编码为AAC"""
+        subprocess.run(
+            [FFMPEG_BINARY, '-y', '-v', 'error', '-t', f'{duration:.3f}', '-i', audio_path,
+             '-vn', '-c:a', 'aac', output_file],
+            check=True
+        )
     # --- END PRIVATE HELPER METHODS ---
 
 
@@ -415,7 +562,8 @@ class EnhancedJingwuGenerator:
                 lyric_clip=lyric_clip,
                 audio_clip=audio,
                 output_path=output_path,
-                draft_mode=draft_mode
+                draft_mode=draft_mode,
+                audio_path=audio_path
             )
 
             print(f"{mode_name}视频生成成功！")
@@ -8,15 +8,19 @@ import os
 from typing import Dict, Tuple, Optional
 from PIL import ImageFont
 import threading
+from functools import lru_cache
 
 
 class FontCache:
     """字体缓存管理器
     
-    线程安全的字体对象缓存，避免重复加载字体文件
+    线程安全的字体对象缓存，避免重复加载字体文件。
+    FreeType字体对象不能被多个线程同时使用，因此字体对象按线程分别缓存，
+    每个线程只加载一次；字体路径解析结果则在所有线程间共享。
     """
     
-    _cache: Dict[Tuple[str, int], ImageFont.FreeTypeFont] = {}
+    _local = threading.local()  # 每个线程各自的 {(字体路径, 字号): 字体对象}
+    _path_cache: Dict[Tuple[Optional[str], str], Optional[str]] = {}
     _lock = threading.Lock()
     _default_fonts = {
         'chinese': ['simsun.ttc', 'simhei.ttf', 'simkai.ttf'],
@@ -41,20 +45,24 @@ class FontCache:
         actual_font_path = cls._resolve_font_path(font_path, language)
         cache_key = (actual_font_path or 'default', size)
         
-        # 检查缓存
-        with cls._lock:
-            if cache_key in cls._cache:
-                return cls._cache[cache_key]
-        
-        # 加载字体
-        font = cls._load_font(actual_font_path, size)
-        
-        # 缓存字体
-        with cls._lock:
-            cls._cache[cache_key] = font
+        # 检查当前线程的缓存
+        fonts = cls._thread_fonts()
+        font = fonts.get(cache_key)
+        if font is None:
+            # 加载字体并缓存
+            font = cls._load_font(actual_font_path, size)
+            fonts[cache_key] = font
         
         return font
     
+    @classmethod
+    def _thread_fonts(cls) -> Dict[Tuple[str, int], ImageFont.FreeTypeFont]:
+        """获取当前线程的字体对象缓存"""
+        fonts = getattr(cls._local, 'fonts', None)
+        if fonts is None:
+            fonts = cls._local.fonts = {}
+        return fonts
+    
     @classmethod
     def _resolve_font_path(cls, font_path: Optional[str], language: str) -> Optional[str]:
         """解析字体路径
@@ -66,6 +74,22 @@ class FontCache:
         Returns:
             实际的字体路径
         """
+        # 解析结果只依赖参数，缓存后避免每次取字体都访问文件系统
+        path_key = (font_path, language)
+        with cls._lock:
+            if path_key in cls._path_cache:
+                return cls._path_cache[path_key]
+        
+        resolved = cls._find_font_path(font_path, language)
+        
+        with cls._lock:
+            cls._path_cache[path_key] = resolved
+        
+        return resolved
+    
+    @classmethod
+    def _find_font_path(cls, font_path: Optional[str], language: str) -> Optional[str]:
+        """在文件系统中查找字体路径（未缓存）"""
         if font_path and os.path.exists(font_path):
             return font_path
         
@@ -110,22 +134,23 @@ class FontCache:
     
     @classmethod
     def clear_cache(cls):
-        """清空字体缓存"""
+        """清空字体缓存（当前线程的字体对象及共享的路径解析结果）"""
+        cls._thread_fonts().clear()
         with cls._lock:
-            cls._cache.clear()
+            cls._path_cache.clear()
     
     @classmethod
     def get_cache_info(cls) -> Dict[str, int]:
         """获取缓存信息
         
         Returns:
-            缓存统计信息
+            缓存统计信息（字体对象为当前线程的缓存）
         """
-        with cls._lock:
-            return {
-                'cached_fonts': len(cls._cache),
-                'cache_keys': list(cls._cache.keys())
-            }
+        fonts = cls._thread_fonts()
+        return {
+            'cached_fonts': len(fonts),
+            'cache_keys': list(fonts.keys())
+        }
 
 
 class TextMetricsCache:
@@ -207,8 +232,9 @@ class TextMetricsCache:
             }
 
 
+@lru_cache(maxsize=4096)
 def detect_text_language(text: str) -> str:
-    """检测文本语言
+    """检测文本语言（纯函数，结果按文本缓存）
     
     Args:
         text: 文本内容
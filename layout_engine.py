@@ -29,6 +29,8 @@ class LayoutElement(ABC):
     定义了所有可以参与布局的视觉元素必须实现的接口
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def calculate_required_rect(self, video_width: int, video_height: int) -> LyricRect:
         """计算所需的显示区域"""
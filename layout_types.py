@@ -19,6 +19,8 @@ class LyricRect:
     
     表示歌词在视频中的显示区域，支持重叠检测和位置计算
     """
+    __slots__ = ('x', 'y', 'width', 'height')
+
     x: int
     y: int
     width: int
@@ -5,8 +5,13 @@ LyricClip - 歌词视频片段容器
 通过frame_function统一渲染，避免多ImageClip合成开销
 """
 
+import os
+import atexit
 import numpy as np
-from typing import List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional, Iterator
 from moviepy import VideoClip
 
 from lyric_timeline import LyricTimeline
@@ -56,6 +61,10 @@ class LyricClip(VideoClip):
             if timeline.element_id in self.layout_result.element_positions:
                 self._timeline_positions[timeline.element_id] = self.layout_result.element_positions[timeline.element_id]
 
+        # 预先生成所有时间轴的文字图片缓存（文字图片在整个显示期间不变）
+        for timeline in timelines:
+            timeline.prerender()
+
         # 初始化帧缓冲区（必须在super().__init__之前，因为MoviePy会立即调用get_frame(0)）
         self.frame_buffer = np.ndarray((self.video_size[1], self.video_size[0], 3), dtype=np.uint8)
         # self.frame_buffer_view = self.frame_buffer[:, :, :3] # 目前分析发现帧缓冲并不需要alpha通道
@@ -135,26 +144,184 @@ class LyricClip(VideoClip):
         Returns:
             渲染的帧数据 (height, width, 3) - RGB格式
         """
-        # 擦除画布
-        if self.background is not None:
-            # 注意：未来可升级为BackgroundTimeline支持背景序列间的平滑过渡
-            self.frame_buffer[:, :] = self.background
-        else:
-            self.frame_buffer.fill(0)
-
-        # 创建渲染上下文
-        context = RenderContext(
-            current_time=t,
-            video_size=self.video_size,
-            fps=self.fps,
-            frame_number=int(t * self.fps)
-        )
+        render_lyric_frame(self.frame_buffer, self.background, self.timelines,
+                           self.video_size, self.fps, t)
+        return self.frame_buffer_view
 
-        # 遍历所有时间轴，渲染当前时间的歌词
-        for timeline in self.timelines:
-            timeline.render(self.frame_buffer, context)
+    def iter_rendered_frames(self, max_workers: Optional[int] = None) -> Iterator[np.ndarray]:
+        """按时间顺序渲染并产出全部帧
 
-        return self.frame_buffer_view
+        Args:
+            max_workers: 工作进程数，None表示使用全部CPU核心，1表示在当前进程中逐帧渲染
+
+        Yields:
+            渲染的帧数据 (height, width, 3) - RGB格式。
+            各帧可能是复用的缓冲区或共享内存的视图，只在取下一帧之前有效，
+            需要保留时由调用方自行复制
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers > 1:
+            yield from self.iter_frames_parallel(max_workers=max_workers)
+            return
+
+        for i in range(int(self.duration * self.fps)):
+            yield self._render_frame(i / self.fps)
+
+    def iter_frames_parallel(self, max_workers: Optional[int] = None,
+                             chunksize: int = 6) -> Iterator[np.ndarray]:
+        """使用多进程渲染全部帧，按时间顺序逐帧产出
+
+        帧之间互不依赖，每个工作进程持有一份时间轴和背景，按时间片段独立渲染。
+        工作进程直接把帧渲染进共享内存中的槽位，主进程按顺序读取，帧数据不经过pickle传输；
+        槽位总大小有上限，编码端较慢时不会在内存中堆积大量帧；共享内存不足时退回单进程渲染。
+
+        Args:
+            max_workers: 工作进程数，None表示使用全部CPU核心
+            chunksize: 每个任务渲染的连续帧数
+
+        Yields:
+            渲染的帧数据 (height, width, 3) - RGB格式。
+            帧为共享内存的视图，调用方需在取下一帧之前用完当前帧；
+            最后一段帧产出的是副本，遍历结束后调用方仍可持有最后一帧
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        n_frames = int(self.duration * self.fps)
+
+        # 共享内存槽位：(槽位数, 每槽帧数, 高, 宽, 3)，每个在途任务占用一个槽位。
+        # 总大小受固定预算和/dev/shm剩余空间限制：tmpfs空间不足时创建仍会成功，写入时才触发SIGBUS
+        frame_bytes = self.video_size[0] * self.video_size[1] * 3
+        max_frames = _shared_memory_limit() // frame_bytes
+        chunksize = max(1, min(chunksize, max_frames // (2 * max_workers)))
+        n_slots = min(2 * max_workers, max_frames // chunksize)
+        shm = None
+        if n_slots > 0:
+            slots_shape = (n_slots, chunksize, self.video_size[1], self.video_size[0], 3)
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=int(np.prod(slots_shape)))
+            except (OSError, ValueError):
+                pass
+        if shm is None:
+            print("   共享内存不足，改为单进程渲染")
+            yield from self.iter_rendered_frames(max_workers=1)
+            return
+
+        starts = iter(range(0, n_frames, chunksize))
+        # 用np.frombuffer映射：数组持有缓冲区导出，仍有视图时共享内存不会被提前关闭
+        slots = np.frombuffer(shm.buf, dtype=np.uint8).reshape(slots_shape)
+
+        def submit(executor, slot):
+            start = next(starts, None)
+            if start is not None:
+                end = min(start + chunksize, n_frames)
+                times = [i / self.fps for i in range(start, end)]
+                pending.append((executor.submit(_render_frames_worker, slot, times), slot, end))
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_frame_worker,
+                initargs=(self.timelines, self.background, self.video_size, self.fps,
+                          shm.name, slots_shape)
+            ) as executor:
+                pending = deque()
+                for slot in range(slots_shape[0]):
+                    submit(executor, slot)
+                while pending:
+                    future, slot, end = pending.popleft()
+                    frames = slots[slot, :future.result()]
+                    if end == n_frames:
+                        # 最后一段产出副本：遍历结束时调用方通常仍持有最后一帧，
+                        # 若为视图则共享内存无法关闭
+                        frames = frames.copy()
+                    yield from frames
+                    # 槽位中的帧已全部交给调用方，复用该槽位渲染下一段
+                    submit(executor, slot)
+        finally:
+            del slots
+            shm.unlink()
+            _close_shared_memory(shm)
+
+
+# 调用方提前结束遍历且仍持有帧视图时暂时无法关闭的共享内存，视图释放后再关闭
+_deferred_segments: List[shared_memory.SharedMemory] = []
+
+
+def _close_shared_memory(shm: Optional[shared_memory.SharedMemory] = None):
+    """关闭共享内存；仍有帧视图时推迟关闭，并重试之前推迟的共享内存"""
+    if shm is not None:
+        _deferred_segments.append(shm)
+    for segment in list(_deferred_segments):
+        try:
+            segment.close()
+        except BufferError:
+            continue  # 仍有视图引用，下次再试
+        _deferred_segments.remove(segment)
+
+
+atexit.register(_close_shared_memory)
+
+
+# 多进程渲染时共享内存帧槽位的总预算（字节）
+_SHARED_FRAME_BUDGET = 256 << 20
+
+
+def _shared_memory_limit() -> int:
+    """共享内存槽位可用的字节数：固定预算与/dev/shm剩余空间中的较小者"""
+    limit = _SHARED_FRAME_BUDGET
+    if hasattr(os, 'statvfs') and os.path.isdir('/dev/shm'):
+        try:
+            st = os.statvfs('/dev/shm')
+        except OSError:
+            return limit
+        # 留出一半剩余空间给其他进程
+        limit = min(limit, st.f_bavail * st.f_frsize // 2)
+    return limit
+
+
+def render_lyric_frame(frame_buffer: np.ndarray, background: Optional[np.ndarray],
+                       timelines: List[LyricTimeline], video_size: Tuple[int, int],
+                       fps: float, t: float):
+    """在帧缓冲区中渲染时间t的完整歌词帧（背景+所有时间轴）"""
+    # 擦除画布
+    if background is not None:
+        # 注意：未来可升级为BackgroundTimeline支持背景序列间的平滑过渡
+        frame_buffer[:, :] = background
+    else:
+        frame_buffer.fill(0)
+
+    # 创建渲染上下文
+    context = RenderContext(
+        current_time=t,
+        video_size=video_size,
+        fps=fps,
+        frame_number=int(t * fps)
+    )
+
+    # 遍历所有时间轴，渲染当前时间的歌词
+    for timeline in timelines:
+        timeline.render(frame_buffer, context)
+
+
+# 多进程渲染的工作进程状态：(共享内存, 帧槽位, 背景, 时间轴列表, 视频尺寸, 帧率)
+_worker_state = None
+
+
+def _init_frame_worker(timelines: List[LyricTimeline], background: Optional[np.ndarray],
+                       video_size: Tuple[int, int], fps: float,
+                       shm_name: str, slots_shape: Tuple[int, ...]):
+    """工作进程初始化：保存时间轴和背景，映射主进程创建的共享内存帧槽位"""
+    global _worker_state
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.frombuffer(shm.buf, dtype=np.uint8).reshape(slots_shape)
+    _worker_state = (shm, slots, background, timelines, video_size, fps)
+
+
+def _render_frames_worker(slot: int, times: List[float]) -> int:
+    """在工作进程中把一段连续的帧直接渲染进共享内存槽位，返回渲染的帧数"""
+    _, slots, background, timelines, video_size, fps = _worker_state
+    for k, t in enumerate(times):
+        render_lyric_frame(slots[slot, k], background, timelines, video_size, fps, t)
+    return len(times)
 
 
 
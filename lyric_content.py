@@ -101,10 +101,16 @@ class LyricContentFactory:
         """
         # 查找当前时间的歌词
         active_lyric = None
+        lyrics_data = timeline.lyrics_data  # 只组装一次
 
-        for i, (start_time, text) in enumerate(timeline.lyrics_data):
-            # 使用正确的持续时间计算逻辑（与旧实现一致）
-            duration = LyricContentFactory.calculate_lyric_duration(timeline, i)
+        # 预先错位出下一句的开始时间，循环中不再按索引回查列表
+        next_starts = [start for start, _ in lyrics_data[1:]]
+        next_starts.append(None)
+
+        for (start_time, text), next_start in zip(lyrics_data, next_starts):
+            # 使用正确的持续时间计算逻辑（与旧实现一致）：
+            # 有下一句时持续到下一句开始，最后一句使用默认持续时间
+            duration = next_start - start_time if next_start is not None else 3.0
 
             if start_time <= t < start_time + duration:
                 active_lyric = (start_time, text, duration)
@@ -123,7 +129,7 @@ class LyricContentFactory:
             style=timeline.style,
             position=layout_rect,
             animation_progress=0.0,  # 将在渲染时计算
-            is_highlighted=timeline._strategy.is_highlighted if hasattr(timeline._strategy, 'is_highlighted') else True
+            is_highlighted=getattr(timeline.strategy, 'is_highlighted', True)
         )
 
         # 计算动画进度
@@ -142,8 +148,11 @@ class LyricContentFactory:
         Returns:
             持续时间（秒）
         """
-        lyrics_data = timeline.lyrics_data
+        return LyricContentFactory._duration_from_data(timeline.lyrics_data, lyric_index)
 
+    @staticmethod
+    def _duration_from_data(lyrics_data, lyric_index: int) -> float:
+        """根据已取得的歌词数据列表计算持续时间"""
         if lyric_index >= len(lyrics_data):
             return 3.0  # 默认持续时间
 
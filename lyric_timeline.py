@@ -10,11 +10,19 @@ LyricTimeline核心类型实现
 - Layout布局器支持
 """
 
+import os
 import re
+import mmap
+import logging
+import cv2
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Tuple, Optional, Dict, Any, Iterator, Callable, Type
 from enum import Enum
+from functools import lru_cache
+from itertools import groupby
 # ImageClip导入已移除 - 新的LyricClip架构不再需要创建ImageClip
 
 # 导入布局相关的数据类型
@@ -22,7 +30,7 @@ from layout_types import LyricRect, LyricStyle
 from layout_engine import LayoutElement
 from lyric_content import RenderContext
 from font_cache import FontCache, detect_text_language
-from basic_animation import AnimationPresets, ANIMATION_VERTICAL_OFFSET
+from basic_animation import AnimationPresets, BasicAnimation, ANIMATION_VERTICAL_OFFSET
 
 class LyricDisplayMode(Enum):
     """歌词显示模式枚举"""
@@ -30,8 +38,20 @@ class LyricDisplayMode(Enum):
     ENHANCED_PREVIEW = "enhanced_preview"  # 增强模式：当前+预览
     KARAOKE_STYLE = "karaoke_style"       # 卡拉OK样式（未来扩展）
 
+logger = logging.getLogger(__name__)
+
 # LyricRect和LyricStyle现在从layout_types模块导入
 
+# 行首可跳过的空白：与str.strip()一致的全部Unicode空白（含全角空格U+3000）的UTF-8编码，不含换行符
+_LRC_LEADING_SPACE = (rb'(?:[ \t\f\v\x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80'
+                      rb'|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)*')
+# LRC歌词行：行首 [MM:SS.CC] 时间标签 + 歌词文本（在整个文件的字节缓冲区上匹配）
+_LRC_LINE_RE = re.compile(rb'^' + _LRC_LEADING_SPACE + rb'\[(\d{2}:\d{2}\.\d{2})\]([^\r\n]*)',
+                          re.MULTILINE)
+
+# 待渲染的文字图片超过此数量时才启用线程池，避免小任务的线程开销
+_PARALLEL_CACHE_MIN_TEXTS = 4
+
 # ============================================================================
 # Layout布局器接口导入 - 已移动到文件顶部
 # ============================================================================
@@ -46,6 +66,8 @@ class LyricDisplayStrategy(ABC):
     定义了所有显示策略必须实现的接口
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def calculate_required_rect(self, timeline: 'LyricTimeline',
                               video_width: int, video_height: int) -> LyricRect:
@@ -56,19 +78,35 @@ class LyricDisplayStrategy(ABC):
     # 新的LyricClip架构不再需要策略类生成ImageClip
     # 所有渲染现在通过LyricClip的统一frame_function处理
 
+    def _parameter_names(self) -> List[str]:
+        """收集继承链上各类__slots__中的公开参数名（基类在前）"""
+        names = []
+        for cls in reversed(type(self).__mro__):
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            names.extend(k for k in slots if not k.startswith('_'))
+        return names
+
     def get_strategy_info(self) -> Dict[str, Any]:
         """获取策略信息"""
         return {
             "strategy_type": self.__class__.__name__,
-            "parameters": self.__dict__.copy()
+            "parameters": {k: getattr(self, k) for k in self._parameter_names()}
         }
 
+    def get_parameters_key(self) -> Tuple[Any, ...]:
+        """获取策略参数元组（用于缓存键，参数被修改后键随之变化）"""
+        return tuple(getattr(self, k) for k in self._parameter_names())
+
 class SimpleFadeStrategy(LyricDisplayStrategy):
     """简单淡入淡出显示策略
 
     用于单行歌词的简单显示，支持淡入淡出效果
     """
 
+    __slots__ = ('y_position', 'is_highlighted')
+
     def __init__(self, y_position: Optional[int] = None, is_highlighted: bool = True):
         self.y_position = y_position
         self.is_highlighted = is_highlighted
@@ -82,8 +120,8 @@ class SimpleFadeStrategy(LyricDisplayStrategy):
         # 使用预计算的最大行数，避免重复计算
         max_lines = timeline._max_lines
 
-        # 估算文字高度（字体大小 * 1.2 作为行高）
-        line_height = int(font_size * 1.2)
+        # 估算文字高度（字体大小 * 1.2 作为行高，整数运算）
+        line_height = font_size * 6 // 5
         total_height = max_lines * line_height
 
         # 为动画预留额外空间（上下各预留ANIMATION_VERTICAL_OFFSET像素）
@@ -109,15 +147,19 @@ class EnhancedPreviewStrategy(LyricDisplayStrategy):
     - 可配置两行的垂直偏移
     """
 
+    __slots__ = ('current_y_offset', 'preview_y_offset', '_abs_offsets')
+
     def __init__(self, current_y_offset: int = -50, preview_y_offset: int = 80):
         self.current_y_offset = current_y_offset
         self.preview_y_offset = preview_y_offset
+        # 偏移量在策略生命周期内不变，预先求和
+        self._abs_offsets = abs(current_y_offset) + abs(preview_y_offset)
 
     def calculate_required_rect(self, timeline: 'LyricTimeline',
                               video_width: int, video_height: int) -> LyricRect:
         """计算增强预览所需区域，支持多行文本"""
         font_size = timeline.style.font_size
-        line_height = int(font_size * 1.2)
+        line_height = font_size * 6 // 5  # 字体大小 * 1.2 作为行高，整数运算
 
         # 使用预计算的最大行数，避免重复计算
         max_lines = timeline._max_lines
@@ -126,7 +168,7 @@ class EnhancedPreviewStrategy(LyricDisplayStrategy):
         single_lyric_height = max_lines * line_height
 
         # 需要容纳当前歌词和预览歌词，考虑偏移量
-        total_height = abs(self.current_y_offset) + abs(self.preview_y_offset) + single_lyric_height * 2
+        total_height = self._abs_offsets + single_lyric_height * 2
         
         # 为动画预留额外空间（上下各预留ANIMATION_VERTICAL_OFFSET像素）
         total_height_with_animation = total_height + 2 * ANIMATION_VERTICAL_OFFSET
@@ -145,6 +187,98 @@ class EnhancedPreviewStrategy(LyricDisplayStrategy):
     # 增强预览逻辑将在LyricClip中实现
 
 
+# 显示模式 -> 策略类
+_STRATEGY_FACTORIES: Dict[LyricDisplayMode, Type[LyricDisplayStrategy]] = {
+    LyricDisplayMode.SIMPLE_FADE: SimpleFadeStrategy,
+    LyricDisplayMode.ENHANCED_PREVIEW: EnhancedPreviewStrategy,
+}
+
+
+def _make_strategy(mode: LyricDisplayMode, **kwargs) -> LyricDisplayStrategy:
+    """按显示模式创建策略实例（每个时间轴持有独立实例，策略参数可安全修改）"""
+    strategy_class = _STRATEGY_FACTORIES.get(mode)
+    if strategy_class is None:
+        raise ValueError(f"不支持的显示模式: {mode}")
+    return strategy_class(**kwargs)
+
+
+@lru_cache(maxsize=4096)
+def _render_text_sprite(text: str, font_size: int,
+                        language: str) -> Optional[Tuple[np.ndarray, int, int, int, int]]:
+    """使用PIL光栅化文字图片（结果按(文本, 字号, 语言)在进程内缓存，各时间轴共享）
+
+    Returns:
+        (裁剪后的只读预乘alpha RGBA图片, x偏移, y偏移, 原始宽度, 原始高度)，无内容时为None
+    """
+    font = FontCache.get_font(
+        font_path=None,  # 使用默认字体
+        size=font_size,
+        language=language
+    )
+
+    # 使用PIL创建文字图片（后续可以优化为纯OpenCV）
+    from PIL import Image, ImageDraw
+
+    # 计算文字尺寸（每行宽度只测量一次，绘制时复用）
+    lines = text.split('\n')
+    line_height = font_size * 6 // 5
+    total_height = len(lines) * line_height
+
+    line_widths = []
+    for line in lines:
+        if line.strip():
+            bbox = font.getbbox(line)
+            line_widths.append(bbox[2] - bbox[0])
+        else:
+            line_widths.append(0)
+    max_width = max(line_widths, default=0)
+
+    if max_width <= 0 or total_height <= 0:
+        logger.debug("跳过无可绘制内容的歌词: %r", text)
+        return None
+
+    # 创建RGBA图像
+    img = Image.new('RGBA', (int(max_width), int(total_height)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    # 颜色与逐行无关，在循环外确定（alpha将在渲染时动态调整）
+    shadow_fill = (0, 0, 0, 200)
+    main_fill = (255, 255, 255, 255)
+
+    # 绘制文字
+    y_offset = 0
+    for line, line_width in zip(lines, line_widths):
+        if line_width > 0:
+            # 计算居中位置
+            x_pos = (max_width - line_width) // 2
+
+            # 绘制阴影
+            draw.text((x_pos + 2, y_offset + 2), line, fill=shadow_fill, font=font)
+
+            # 绘制主文字
+            draw.text((x_pos, y_offset), line, fill=main_fill, font=font)
+
+        y_offset += line_height
+
+    # 转换为预乘alpha（RGB已乘以A/255）的numpy数组，渲染时省去前景的逐像素乘法；
+    # 直接包装tobytes()的缓冲区（只读，后续只做读取和裁剪）
+    text_array = np.frombuffer(img.convert('RGBa').tobytes(), dtype=np.uint8).reshape(
+        int(total_height), int(max_width), 4)
+
+    # 裁剪到不透明像素的包围盒，透明边缘不再参与每帧的混合；
+    # 同时记录裁剪偏移和原始尺寸，定位仍按完整图片计算
+    opaque = text_array[:, :, 3]
+    rows = np.flatnonzero(opaque.any(axis=1))
+    cols = np.flatnonzero(opaque.any(axis=0))
+    if not len(rows):
+        logger.debug("跳过无可绘制内容的歌词: %r", text)
+        return None
+
+    dy, dx = int(rows[0]), int(cols[0])
+    cropped = np.ascontiguousarray(text_array[dy:rows[-1] + 1, dx:cols[-1] + 1])
+    cropped.setflags(write=False)  # 多个时间轴共享同一数组，禁止原地修改
+    return cropped, dx, dy, int(max_width), int(total_height)
+
 
 # ============================================================================
 # 主要的LyricTimeline类
@@ -157,13 +291,22 @@ class LyricTimeline(LayoutElement):
     现在实现了LayoutElement接口，可以参与布局引擎的自动布局
     """
 
+    __slots__ = ('_start_times', '_texts', 'language', 'style', 'display_mode', '_strategy',
+                 '_element_id', '_priority', '_is_flexible', '_processed_lyrics',
+                 '_processed_timestamps', '_processed_cache', '_max_lines',
+                 '_timing_cache', '_fade_in_cache', '_window_memo',
+                 '_rect_cache', '_sprite_ids', '_sprite_texts', '_text_cache', '_position_memo',
+                 '_cache_style_key',
+                 '_info')
+
     def __init__(self, lyrics_data: List[Tuple[float, str]],
                  language: str = "unknown",
                  style: Optional[LyricStyle] = None,
                  display_mode: LyricDisplayMode = LyricDisplayMode.SIMPLE_FADE,
                  element_id: Optional[str] = None,
                  priority: int = 10,
-                 is_flexible: bool = True):
+                 is_flexible: bool = True,
+                 _sorted: bool = False):
         """初始化歌词时间轴
 
         Args:
@@ -174,8 +317,14 @@ class LyricTimeline(LayoutElement):
             element_id: 元素唯一标识（用于布局引擎）
             priority: 布局优先级（数字越小优先级越高）
             is_flexible: 是否可调整位置（用于自动布局）
+            _sorted: 内部参数，调用方保证lyrics_data已按时间排序时跳过重复排序
         """
-        self.lyrics_data = sorted(lyrics_data, key=lambda x: x[0])  # 按时间排序
+        # 按时间排序（已排序的输入直接使用）
+        sorted_lyrics = lyrics_data if _sorted else sorted(lyrics_data, key=itemgetter(0))
+        # 按结构数组(SoA)存储：时间戳为连续的float64数组，文本为并行列表
+        self._start_times = np.fromiter((t for t, _ in sorted_lyrics), dtype=np.float64,
+                                        count=len(sorted_lyrics))
+        self._texts: List[str] = [text for _, text in sorted_lyrics]
         self.language = language
         self.style = style or LyricStyle()
         self.display_mode = display_mode
@@ -188,13 +337,36 @@ class LyricTimeline(LayoutElement):
 
         # 预处理多行文本信息，统一处理，避免策略类重复实现
         self._processed_lyrics = self._preprocess_lyrics()
+        self._processed_timestamps = np.fromiter((t for t, _ in self._processed_lyrics), dtype=np.float64,
+                                                 count=len(self._processed_lyrics))
         self._max_lines = self._calculate_max_lines()
+        self._processed_cache: Dict[float, List[Tuple[float, List[str]]]] = {}
+
+        # 持续时间与结束时间按max_duration缓存，淡入开始时间按动画时长缓存
+        self._timing_cache: Dict[float, Tuple[List[float], np.ndarray, np.ndarray]] = {}
+        self._fade_in_cache: Dict[float, np.ndarray] = {}
+        # 活动歌词候选窗口的单槽缓存：((lo, hi, max_duration, animation_duration), 候选列表)
+        self._window_memo: Optional[Tuple[Tuple[int, int, float, float], List[Tuple[Any, ...]]]] = None
+
+        # 布局区域缓存，切换显示模式时失效
+        self._rect_cache: Dict[Tuple[Any, ...], LyricRect] = {}
+
+        # 每句歌词对应的文字图片编号，相同文本（如副歌）共享同一编号和同一张图片
+        sprite_index: Dict[str, int] = {}
+        self._sprite_ids = [sprite_index.setdefault(text, len(sprite_index)) for text in self._texts]
+        self._sprite_texts = list(sprite_index)
 
-        # 文字图片缓存系统（OpenCV优化）
-        self._text_cache = {}  # 缓存预渲染的文字图片
-        self._cache_initialized = False
+        # 文字图片缓存系统（OpenCV优化），按文字图片编号索引的列表，首次渲染时一次性全部生成
+        # 缓存预渲染的文字图片：(裁剪后的图片, x偏移, y偏移, 原始宽度, 原始高度)，无内容时为None
+        self._text_cache: List[Optional[Tuple[np.ndarray, int, int, int, int]]] = []
+        # 各文字图片静态渲染位置的单槽缓存：((视频尺寸, 显示模式, 策略, 策略参数, 样式), 位置列表)
+        self._position_memo: Optional[Tuple[Tuple[Any, ...], List[Optional[Tuple[int, int, int]]]]] = None
+        self._cache_style_key: Optional[Tuple[Any, ...]] = None  # 生成缓存时的样式，None表示尚未初始化
 
-        self._setup_strategy()
+        # get_info()结果缓存
+        self._info: Optional[Dict[str, Any]] = None
+
+        # 显示策略延迟到首次使用时创建（通常紧接着会被set_display_mode覆盖）
 
     def _preprocess_lyrics(self) -> List[Tuple[float, List[str]]]:
         """预处理歌词数据，将文本转换为清理后的字符串数组
@@ -207,29 +379,35 @@ class LyricTimeline(LayoutElement):
             List[Tuple[float, List[str]]]: [(时间戳, [清理后的行列表]), ...]
         """
         processed = []
-        for timestamp, text in self.lyrics_data:
-            # 分割并清理空行，统一在这里处理
-            lines = text.split('\n')
-            cleaned_lines = [line.strip() for line in lines if line.strip()]
+        strip = str.strip
+        for timestamp, text in zip(self._start_times.tolist(), self._texts):
+            # 分割并清理空行，统一在这里处理（每行只strip一次）
+            cleaned_lines = [line for line in map(strip, text.split('\n')) if line]
             if cleaned_lines:  # 只保留有内容的歌词
                 processed.append((timestamp, cleaned_lines))
         return processed
 
+    @property
+    def lyrics_data(self) -> List[Tuple[float, str]]:
+        """歌词数据列表 [(时间戳, 歌词文本), ...]（向后兼容接口，按需组装）"""
+        return list(zip(self._start_times.tolist(), self._texts))
+
     def _calculate_max_lines(self) -> int:
         """预计算所有歌词中的最大行数，基于预处理后的数据"""
-        max_lines = 1
-        for _, lines in self._processed_lyrics:
-            max_lines = max(max_lines, len(lines))
-        return max_lines
+        line_counts = np.fromiter((len(lines) for _, lines in self._processed_lyrics), dtype=np.int32,
+                                  count=len(self._processed_lyrics))
+        return int(line_counts.max(initial=1))
+
+    @property
+    def strategy(self) -> LyricDisplayStrategy:
+        """当前显示策略（首次访问时按显示模式创建）"""
+        if self._strategy is None:
+            self._setup_strategy()
+        return self._strategy
 
     def _setup_strategy(self):
         """根据显示模式设置策略"""
-        if self.display_mode == LyricDisplayMode.SIMPLE_FADE:
-            self._strategy = SimpleFadeStrategy()
-        elif self.display_mode == LyricDisplayMode.ENHANCED_PREVIEW:
-            self._strategy = EnhancedPreviewStrategy()
-        else:
-            raise ValueError(f"不支持的显示模式: {self.display_mode}")
+        self._strategy = _make_strategy(self.display_mode)
 
     def set_display_mode(self, mode: LyricDisplayMode, **kwargs):
         """设置显示模式
@@ -239,12 +417,9 @@ class LyricTimeline(LayoutElement):
             **kwargs: 策略特定的参数
         """
         self.display_mode = mode
-        if mode == LyricDisplayMode.SIMPLE_FADE:
-            self._strategy = SimpleFadeStrategy(**kwargs)
-        elif mode == LyricDisplayMode.ENHANCED_PREVIEW:
-            self._strategy = EnhancedPreviewStrategy(**kwargs)
-        else:
-            raise ValueError(f"不支持的显示模式: {mode}")
+        self._rect_cache.clear()
+        self._info = None
+        self._strategy = _make_strategy(mode, **kwargs)
 
     def get_filtered_lyrics(self, max_duration: float) -> List[Tuple[float, str]]:
         """获取过滤后的歌词数据（向后兼容接口）
@@ -255,13 +430,23 @@ class LyricTimeline(LayoutElement):
         Returns:
             过滤后的歌词数据，确保所有歌词的开始时间都在时长限制内
         """
-        return [(t, text) for t, text in self.lyrics_data if t < max_duration]
+        # 歌词已按时间排序，二分查找截断位置后直接切片
+        idx = int(np.searchsorted(self._start_times, max_duration, side='left'))
+        return list(zip(self._start_times[:idx].tolist(), self._texts[:idx]))
 
     def calculate_required_rect(self, video_width: int, video_height: int) -> LyricRect:
         """计算所需的显示区域"""
-        if not self._strategy:
-            raise ValueError("显示策略未设置")
-        return self._strategy.calculate_required_rect(self, video_width, video_height)
+        strategy = self.strategy
+
+        # 渲染期间尺寸、样式和策略参数都不变，结果可直接复用；
+        # 键中包含策略参数，直接修改策略属性时不会命中过期结果
+        key = (id(strategy), video_width, video_height, self.style.font_size,
+               self._max_lines, strategy.get_parameters_key())
+        rect = self._rect_cache.get(key)
+        if rect is None:
+            rect = strategy.calculate_required_rect(self, video_width, video_height)
+            self._rect_cache[key] = rect
+        return rect
 
     # generate_clips方法已移除
     # 新的LyricClip架构不再需要LyricTimeline生成ImageClip
@@ -289,44 +474,81 @@ class LyricTimeline(LayoutElement):
         Returns:
             歌词内容列表，每个元素包含text, start_time, duration, animation_progress, animation等信息
         """
-        active_lyrics = []
-
-        for i, (start_time, text) in enumerate(self.lyrics_data):
-            duration = self._calculate_lyric_duration(i, max_duration)
-
-            # 计算有效显示时间范围（包括提前淡入）
-            fade_in_start = start_time - animation_duration
-            fade_in_end = start_time
-            fade_out_start = start_time + duration - animation_duration
-            fade_out_end = start_time + duration
-
-            # 检查当前时间是否在显示范围内
-            if fade_in_start <= t < fade_out_end:
-                # 计算动画进度
-                if t < fade_in_end:
-                    animation_progress = (t - fade_in_start) / animation_duration
-                    animation = AnimationPresets.FADE_IN
-                elif t >= fade_out_start:
-                    animation_progress = (t - fade_out_start) / animation_duration
-                    animation = AnimationPresets.FADE_OUT
-                else:
-                    animation_progress = 0.5
-                    animation = AnimationPresets.STABLE
-                                    
-                active_lyrics.append({
-                    'text': text,
-                    'start_time': start_time,
-                    'duration': duration,
-                    'animation': (animation_progress,animation),
-                    'index': i,
-                    'language': self.language,
-                    'style': self.style
-                })
+        active_lyrics = [
+            {
+                'text': text,
+                'start_time': start_time,
+                'duration': duration,
+                'animation': (animation_progress, animation),
+                'index': i,
+                'language': self.language,
+                'style': self.style
+            }
+            for i, start_time, text, duration, animation_progress, animation
+            in self._iter_active_lyrics(t, max_duration, animation_duration)
+        ]
 
         # 按开始时间排序，确保稳定的渲染顺序
-        active_lyrics.sort(key=lambda x: x['start_time'])
+        active_lyrics.sort(key=itemgetter('start_time'))
         return active_lyrics
 
+    def _iter_active_lyrics(self, t: float, max_duration: float = float('inf'),
+                            animation_duration: float = 0.3
+                            ) -> Iterator[Tuple[int, float, str, float, float, BasicAnimation]]:
+        """遍历指定时间的活动歌词（歌词时间轴的唯一遍历路径）
+
+        Yields:
+            (索引, 开始时间, 文本, 持续时间, 动画进度, 动画实例)
+        """
+        durations, end_times, end_bounds = self._get_lyric_timing(max_duration)
+        fade_in_starts = self._fade_in_cache.get(animation_duration)
+        if fade_in_starts is None:
+            fade_in_starts = self._start_times - animation_duration
+            self._fade_in_cache[animation_duration] = fade_in_starts
+
+        # 二分查找候选窗口：hi之前的歌词都已开始淡入；lo之前的歌词都已结束
+        lo = int(np.searchsorted(end_bounds, t, side='right'))
+        hi = int(np.searchsorted(fade_in_starts, t, side='right'))
+        if lo >= hi:
+            return
+
+        # 相邻帧的候选窗口通常相同：单槽缓存窗口内歌词的时间和文本，命中时跳过数组切片与转换
+        # 各句的淡入/淡出边界只与窗口有关，随候选一起缓存，逐帧只剩比较和一次除法
+        window_key = (lo, hi, max_duration, animation_duration)
+        memo = self._window_memo
+        if memo is not None and memo[0] == window_key:
+            candidates = memo[1]
+        else:
+            texts = self._texts
+            candidates = []
+            for i, start_time, end_time in zip(range(lo, hi), self._start_times[lo:hi].tolist(),
+                                               end_times[lo:hi].tolist()):
+                duration = durations[i]
+                # 计算有效显示时间范围（包括提前淡入）
+                fade_in_start = start_time - animation_duration
+                fade_out_start = start_time + duration - animation_duration
+                candidates.append((i, start_time, end_time, texts[i], duration,
+                                   fade_in_start, fade_out_start))
+            self._window_memo = (window_key, candidates)
+
+        for i, start_time, end_time, text, duration, fade_in_start, fade_out_start in candidates:
+            # 窗口内仍需逐句确认尚未结束（结束时间不一定严格单调）
+            if not t < end_time:
+                continue
+
+            # 计算动画进度（淡入结束即开始时间）
+            if t < start_time:
+                animation_progress = (t - fade_in_start) / animation_duration
+                animation = AnimationPresets.FADE_IN
+            elif t >= fade_out_start:
+                animation_progress = (t - fade_out_start) / animation_duration
+                animation = AnimationPresets.FADE_OUT
+            else:
+                animation_progress = 0.5
+                animation = AnimationPresets.STABLE
+
+            yield i, start_time, text, duration, animation_progress, animation
+
     def _calculate_lyric_duration(self, lyric_index: int, max_duration: float = float('inf')) -> float:
         """计算歌词持续时间
 
@@ -337,21 +559,54 @@ class LyricTimeline(LayoutElement):
         Returns:
             持续时间（秒）
         """
-        if lyric_index >= len(self.lyrics_data):
+        if lyric_index >= len(self._texts):
             return 3.0  # 默认持续时间
 
-        current_time = self.lyrics_data[lyric_index][0]
+        return self._get_lyric_durations(max_duration)[lyric_index]
 
-        # 如果有下一句歌词，使用下一句的开始时间
-        if lyric_index + 1 < len(self.lyrics_data):
-            next_time = self.lyrics_data[lyric_index + 1][0]
-            return next_time - current_time
+    def _get_lyric_durations(self, max_duration: float = float('inf')) -> List[float]:
+        """获取所有歌词的持续时间列表（按max_duration缓存）
 
-        # 最后一句歌词：持续到视频结束
-        if max_duration != float('inf'):
-            return max(3.0, max_duration - current_time)  # 至少3秒，最多到视频结束
-        else:
-            return float('inf')  # 持续到视频结束
+        Args:
+            max_duration: 视频最大时长，用于限制最后一句歌词的持续时间
+
+        Returns:
+            与歌词一一对应的持续时间列表（秒）
+        """
+        return self._get_lyric_timing(max_duration)[0]
+
+    def _get_lyric_timing(self, max_duration: float = float('inf')
+                          ) -> Tuple[List[float], np.ndarray, np.ndarray]:
+        """获取所有歌词的持续时间和结束时间（按max_duration缓存）
+
+        一次性向量化计算，避免在每帧的循环中逐句判断是否存在下一句歌词
+
+        Args:
+            max_duration: 视频最大时长，用于限制最后一句歌词的持续时间
+
+        Returns:
+            (持续时间列表, 结束时间数组, 结束时间前缀最大值数组)，均与歌词一一对应（秒）；
+            前缀最大值单调不减，可用于二分查找第一句可能仍在显示的歌词
+        """
+        timing = self._timing_cache.get(max_duration)
+        if timing is not None:
+            return timing
+
+        starts = self._start_times
+        durations_arr = np.empty_like(starts)
+        if len(starts):
+            # 如果有下一句歌词，使用下一句的开始时间
+            durations_arr[:-1] = starts[1:] - starts[:-1]
+            # 最后一句歌词：持续到视频结束
+            if max_duration != float('inf'):
+                durations_arr[-1] = max(3.0, max_duration - starts[-1])  # 至少3秒，最多到视频结束
+            else:
+                durations_arr[-1] = float('inf')  # 持续到视频结束
+
+        end_times = starts + durations_arr
+        timing = (durations_arr.tolist(), end_times, np.maximum.accumulate(end_times))
+        self._timing_cache[max_duration] = timing
+        return timing
 
     def render(self, frame_buffer: np.ndarray, context: RenderContext):
         """渲染歌词到帧缓冲区（OpenCV优化版本，支持多条歌词同时显示）
@@ -360,190 +615,189 @@ class LyricTimeline(LayoutElement):
             frame_buffer: 目标帧缓冲区 (height, width, 3) - RGB格式
             context: 渲染上下文
         """
-        # 初始化缓存（如果需要）
-        if not self._cache_initialized:
-            self._initialize_text_cache(context.video_size)
-            self._cache_initialized = True
-
-        # 获取当前时间的所有活动歌词（支持多条歌词同时显示）
-        active_lyrics = self.get_content_at_time(context.current_time)
-        if not active_lyrics:
-            return
-
-        # 遍历所有活动歌词，按顺序渲染
-        for lyric in active_lyrics:
-            animation_progress, animation = lyric['animation']
-            props = {'y_offset': 0, 'alpha': 1.0}
+        # 初始化缓存（如果需要）；样式变化后按新样式重建
+        self.prerender()
+
+        # 循环不变量提到循环外：缓存列表、文字图片编号、属性字典（由effect原地覆盖）
+        text_cache = self._text_cache
+        sprite_ids = self._sprite_ids
+        props = {'y_offset': 0, 'alpha': 1.0}
+        base_positions = self._get_base_positions(context.video_size)
+
+        # 流式遍历当前时间的所有活动歌词（支持多条歌词同时显示）
+        # 歌词已按开始时间排序，生成器的产出顺序即渲染顺序，无需构建字典列表再排序
+        for i, _, _, _, animation_progress, animation in self._iter_active_lyrics(context.current_time):
             animation.effect(props, animation_progress)
             alpha = props['alpha']
             if alpha < 0.001:  # 过滤掉几乎不可见的歌词
                 continue
             y_offset = props['y_offset']
 
-            # 获取缓存的文字图片
-            cache_key = self._get_cache_key(lyric['text'])
-            if cache_key not in self._text_cache:
-                # 如果缓存中没有，动态创建
-                self._create_text_image_opencv(lyric['text'], cache_key, context.video_size)
-
-            # 使用OpenCV alpha blending渲染到帧缓冲区
-            self._render_cached_text_opencv(frame_buffer, cache_key, y_offset=y_offset,alpha=alpha, context=context)
-
-    def _initialize_text_cache(self, video_size: Tuple[int, int]):
-        """初始化文字图片缓存"""
-        # 预计算所有歌词的文字图片
-        print(f"   初始化文字缓存，共 {len(self.lyrics_data)} 条歌词...")
-        for timestamp, text in self.lyrics_data:
-            cache_key = self._get_cache_key(text)
-            if cache_key not in self._text_cache:
-                self._create_text_image_opencv(text, cache_key, video_size)
-        print(f"   ✅ 文字缓存初始化完成，缓存 {len(self._text_cache)} 个文字图片")
+            # 获取缓存的文字图片（缓存已全部预热，按整数编号直接索引）
+            sprite_id = sprite_ids[i]
+            sprite = text_cache[sprite_id]
+            if sprite is None:
+                continue
 
-    def _get_cache_key(self, text: str) -> str:
-        """生成缓存键"""
-        # 使用文本内容和样式信息生成唯一键
-        style_key = f"{self.style.font_size}_{self.style.font_color}_{self.style.highlight_color}"
-        return f"{hash(text)}_{hash(style_key)}"
-
-    def _create_text_image_opencv(self, text: str, cache_key: str, video_size: Tuple[int, int]):
-        """使用OpenCV创建文字图片并缓存"""
-        # 检测文本语言
-        language = detect_text_language(text)
-
-        # 获取字体
-        font = FontCache.get_font(
-            font_path=None,  # 使用默认字体
-            size=self.style.font_size,
-            language=language
-        )
+            # 静态基准位置已按文字图片预先算好，每帧只叠加动画位移
+            x, y, dy = base_positions[sprite_id]
 
-        # 使用PIL创建文字图片（后续可以优化为纯OpenCV）
-        from PIL import Image, ImageDraw
+            # 使用OpenCV alpha blending渲染到帧缓冲区
+            self._opencv_alpha_blend(frame_buffer, sprite[0], x, int(y + y_offset) + dy, alpha)
 
-        # 计算文字尺寸
-        lines = text.split('\n')
-        line_height = int(self.style.font_size * 1.2)
-        max_width = 0
-        total_height = len(lines) * line_height
+    def prerender(self):
+        """预先生成所有歌词的文字图片缓存（已按当前样式生成时不做任何事）
 
-        for line in lines:
-            if line.strip():
-                bbox = font.getbbox(line)
-                line_width = bbox[2] - bbox[0]
-                max_width = max(max_width, line_width)
+        文字图片在整个显示期间不变，创建视频片段时调用一次即可，
+        避免首帧渲染时才生成，也让多进程渲染的工作进程直接继承已生成的缓存
+        """
+        style_key = self._get_style_key()
+        if self._cache_style_key != style_key:
+            self._initialize_text_cache()
+            self._cache_style_key = style_key
 
-        if max_width <= 0 or total_height <= 0:
-            self._text_cache[cache_key] = None
-            return
+    def _initialize_text_cache(self):
+        """初始化文字图片缓存"""
+        # 预计算所有歌词的文字图片；重复的歌词（如副歌）只渲染一次
+        print(f"   初始化文字缓存，共 {len(self._texts)} 条歌词（{len(self._sprite_texts)} 条不重复）...")
+        self._text_cache = [None] * len(self._sprite_texts)
+        pending = [(text, sprite_id) for sprite_id, text in enumerate(self._sprite_texts)]
+
+        # 各句歌词的文字图片相互独立，数量较多时用线程池并行渲染
+        # （字体对象由FontCache按线程缓存，不会被多个线程同时使用）
+        # 每个线程处理一批
+        if len(pending) > _PARALLEL_CACHE_MIN_TEXTS:
+            max_workers = min(len(pending), os.cpu_count() or 1)
+            batches = [pending[k::max_workers] for k in range(max_workers)]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(self._cache_text_images, batches))
+        else:
+            self._cache_text_images(pending)
+        skipped = self._text_cache.count(None)
+        if skipped:
+            logger.info("跳过 %d 条无可绘制内容的歌词", skipped)
+        print(f"   ✅ 文字缓存初始化完成，缓存 {len(self._text_cache)} 个文字图片")
 
-        # 创建RGBA图像
-        img = Image.new('RGBA', (int(max_width), int(total_height)), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    def _get_style_key(self) -> Tuple[Any, ...]:
+        """影响文字图片的样式参数（样式变化时缓存失效；不使用hash()，跨进程保持一致）"""
+        return (self.style.font_size, self.style.font_color, self.style.highlight_color)
 
-        # 绘制文字
-        y_offset = 0
-        for line in lines:
-            if line.strip():
-                # 计算居中位置
-                bbox = font.getbbox(line)
-                line_width = bbox[2] - bbox[0]
-                x_pos = (max_width - line_width) // 2
+    def _cache_text_images(self, items: List[Tuple[str, int]]):
+        """按文字图片编号缓存文字图片
 
-                # 绘制阴影
-                draw.text((x_pos + 2, y_offset + 2), line, fill=(0, 0, 0, 200), font=font)
+        光栅化结果由进程级LRU缓存共享，多个时间轴中相同的文本（同字号）只渲染一次
 
-                # 绘制主文字（白色，alpha将在渲染时动态调整）
-                draw.text((x_pos, y_offset), line, fill=(255, 255, 255, 255), font=font)
+        Args:
+            items: [(歌词文本, 文字图片编号), ...]
+        """
+        for text, sprite_id in items:
+            self._text_cache[sprite_id] = _render_text_sprite(
+                text, self.style.font_size, detect_text_language(text))
 
-            y_offset += line_height
+    def _get_base_positions(self, video_size: Tuple[int, int]) -> List[Optional[Tuple[int, int, int]]]:
+        """获取每张文字图片的静态渲染基准位置（按文字图片编号索引）
 
-        # 转换为numpy数组并缓存
-        text_array = np.array(img)
-        self._text_cache[cache_key] = text_array
+        位置只取决于显示模式、策略参数、视频尺寸和文字图片尺寸，
+        在这些不变时复用上次的结果，渲染时不再逐帧重新计算
 
-    def _render_cached_text_opencv(self, frame_buffer: np.ndarray, cache_key: str,
-                                  y_offset: int, alpha: float, context: RenderContext):
-        """使用OpenCV将缓存的文字图片渲染到帧缓冲区"""
-        if cache_key not in self._text_cache or self._text_cache[cache_key] is None:
-            return
+        Returns:
+            [(含裁剪偏移的x, 未叠加动画位移的y, 裁剪的y偏移) 或 None, ...]
+        """
+        strategy = self.strategy
+        key = (video_size, self.display_mode, strategy, strategy.get_parameters_key(),
+               self._cache_style_key)
+        memo = self._position_memo
+        if memo is not None and memo[0] == key:
+            return memo[1]
+
+        position = self._get_position_function(video_size)
+        base_positions: List[Optional[Tuple[int, int, int]]] = []
+        for sprite in self._text_cache:
+            if sprite is None:
+                base_positions.append(None)
+                continue
+            _, dx, dy, text_width, text_height = sprite
+            x, y = position(text_width, text_height)
+            base_positions.append((x + dx, y, dy))
 
-        text_img = self._text_cache[cache_key]
+        self._position_memo = (key, base_positions)
+        return base_positions
 
-        # 计算渲染位置（传递动画进度用于位移计算）
-        render_pos = self._get_render_position(text_img.shape, context)
-        if render_pos is None:
-            return
+    def _get_position_function(self, video_size: Tuple[int, int]) -> Callable[[int, int], Tuple[int, int]]:
+        """根据显示策略生成特化的渲染位置计算函数
 
-        x, y = render_pos
-        y = int(y+y_offset)
+        显示模式、策略参数和视频尺寸在一帧内不变，预先求值后
+        返回的函数只需根据文字图片尺寸计算左上角坐标
 
-        # 使用OpenCV进行alpha blending
-        self._opencv_alpha_blend(frame_buffer, text_img, x, y, alpha)
+        Returns:
+            position(text_width, text_height) -> (x, y)
+        """
+        video_width, video_height = video_size
 
-    def _get_render_position(self, text_shape: Tuple[int, int, int], context: RenderContext) -> Optional[Tuple[int, int]]:
-        """根据显示策略计算渲染位置，支持动画偏移"""
-        text_height, text_width = text_shape[:2]
-        video_width, video_height = context.video_size
-        
-        
         if self.display_mode == LyricDisplayMode.SIMPLE_FADE:
             # 简单模式：使用策略中的y_position
-            if self._strategy and isinstance(self._strategy, SimpleFadeStrategy):
-                y_pos = self._strategy.y_position
-                if y_pos is None:
-                    y_pos = video_height // 2
+            strategy = self.strategy
+            if isinstance(strategy, SimpleFadeStrategy):
+                center_y = strategy.y_position
+                if center_y is None:
+                    center_y = video_height // 2
             else:
-                y_pos = video_height // 2
-            x_pos = (video_width - text_width) // 2
-            return (x_pos, y_pos - text_height // 2)
+                center_y = video_height // 2
 
         elif self.display_mode == LyricDisplayMode.ENHANCED_PREVIEW:
             # 增强预览模式：使用策略中的current_y_offset
-            if self._strategy and isinstance(self._strategy, EnhancedPreviewStrategy):
-                current_y_offset = self._strategy.current_y_offset
+            strategy = self.strategy
+            if isinstance(strategy, EnhancedPreviewStrategy):
+                current_y_offset = strategy.current_y_offset
                 if current_y_offset is None:
                     current_y_offset = -50
             else:
                 current_y_offset = -50
             center_y = video_height // 2 + current_y_offset
-            x_pos = (video_width - text_width) // 2
-            return (x_pos, center_y - text_height // 2)
 
-        # 默认居中
-        return ((video_width - text_width) // 2, (video_height - text_height) // 2)
+        else:
+            # 默认居中
+            def position(text_width: int, text_height: int) -> Tuple[int, int]:
+                return ((video_width - text_width) // 2, (video_height - text_height) // 2)
+            return position
+
+        def position(text_width: int, text_height: int) -> Tuple[int, int]:
+            return ((video_width - text_width) // 2, center_y - text_height // 2)
+        return position
 
     def _opencv_alpha_blend(self, background: np.ndarray, foreground: np.ndarray,
                            x: int, y: int, alpha_factor: float):
-        """使用OpenCV进行alpha混合"""
-        if foreground.shape[2] != 4:  # 确保前景有alpha通道
-            return
-
+        """使用OpenCV进行alpha混合（前景为文字缓存中预乘alpha的RGBA图片）"""
+        bg_height, bg_width = background.shape[:2]
         fg_height, fg_width = foreground.shape[:2]
 
-        # 确保不超出边界
-        x = max(0, min(x, background.shape[1] - fg_width))
-        y = max(0, min(y, background.shape[0] - fg_height))
-
-        end_y = min(y + fg_height, background.shape[0])
-        end_x = min(x + fg_width, background.shape[1])
-        actual_height = end_y - y
-        actual_width = end_x - x
-
-        if actual_height <= 0 or actual_width <= 0:
+        # 确保不超出边界：整体平移进画面，比画面更大的部分裁掉；一次算出左上角和有效尺寸
+        x = max(0, min(x, bg_width - fg_width))
+        y = max(0, min(y, bg_height - fg_height))
+        width = min(fg_width, bg_width - x)
+        height = min(fg_height, bg_height - y)
+        if width <= 0 or height <= 0:
             return
 
-        # 获取区域
-        bg_region = background[y:end_y, x:end_x]
-        fg_region = foreground[:actual_height, :actual_width]
-
-        # 提取alpha通道并应用动画进度
-        alpha = fg_region[:, :, 3:4].astype(np.float32) / 255.0 * alpha_factor
-
-        # 执行alpha混合
-        bg_region[:, :, :3] = (
-            bg_region[:, :, :3].astype(np.float32) * (1 - alpha) +
-            fg_region[:, :, :3].astype(np.float32) * alpha
-        ).astype(np.uint8)
+        # 获取区域（视图，不复制）
+        bg_region = background[y:y + height, x:x + width]
+        fg_region = foreground[:height, :width]
+
+        alpha = cv2.extractChannel(fg_region, 3)
+        fg_part = cv2.cvtColor(fg_region, cv2.COLOR_RGBA2RGB)
+        if alpha_factor < 1.0:
+            # 动画透明度通过256项查找表作用到alpha通道，得到0-255的整数权重；
+            # 前景已预乘alpha，只需经同一查找表缩放
+            # （完全显示是绝大多数帧的情况，此时查找表是恒等映射，直接跳过）
+            alpha_lut = np.rint(np.arange(256, dtype=np.float32) * alpha_factor).astype(np.uint8)
+            alpha = cv2.LUT(alpha, alpha_lut)
+            fg_part = cv2.LUT(fg_part, alpha_lut)
+        alpha3 = cv2.merge((alpha, alpha, alpha))
+
+        # 执行alpha混合：bg*(255-a)/255 + fg_premul*alpha_factor
+        # 全程uint8，由OpenCV的C实现逐像素完成
+        bg_part = cv2.multiply(bg_region, cv2.bitwise_not(alpha3), scale=1 / 255)
+        cv2.add(bg_part, fg_part, dst=bg_region)
 
     def get_processed_lyrics(self, max_duration: float = float('inf')) -> List[Tuple[float, List[str]]]:
         """获取预处理后的歌词数据，供策略类使用
@@ -556,19 +810,40 @@ class LyricTimeline(LayoutElement):
 
         Returns:
             List[Tuple[float, List[str]]]: [(时间戳, [清理后的行列表]), ...]
+            （结果按max_duration缓存共享，调用方请勿修改）
         """
-        return [(t, lines) for t, lines in self._processed_lyrics if t < max_duration]
+        processed = self._processed_cache.get(max_duration)
+        if processed is None:
+            # 预处理结果已按时间排序，二分查找截断位置后直接切片
+            idx = int(np.searchsorted(self._processed_timestamps, max_duration, side='left'))
+            processed = self._processed_lyrics[:idx]
+            self._processed_cache[max_duration] = processed
+        return processed
 
     def get_info(self) -> Dict[str, Any]:
-        """获取时间轴信息"""
+        """获取时间轴信息
+
+        歌词统计和布局属性构建后缓存，在set_display_mode/set_layout_properties中失效；
+        可被直接赋值或原地修改的公开属性（语言、显示模式、样式、策略参数）每次重新读取。
+        返回副本，调用方可自由修改
+        """
+        if self._info is None:
+            self._info = self._build_info()
+        info = dict(self._info)
+        info.update(language=self.language, display_mode=self.display_mode.value,
+                    style=self.style, strategy_info=self.strategy.get_strategy_info())
+        return info
+
+    def _build_info(self) -> Dict[str, Any]:
+        """构建时间轴信息字典"""
         return {
             "language": self.language,
-            "total_lines": len(self.lyrics_data),
+            "total_lines": len(self._texts),
             "max_lines": self._max_lines,
-            "duration": self.lyrics_data[-1][0] if self.lyrics_data else 0,
+            "duration": float(self._start_times[-1]) if len(self._start_times) else 0,
             "display_mode": self.display_mode.value,
             "style": self.style,
-            "strategy_info": self._strategy.get_strategy_info() if self._strategy else None,
+            "strategy_info": self.strategy.get_strategy_info(),
             "element_id": self._element_id,
             "priority": self._priority,
             "is_flexible": self._is_flexible
@@ -603,6 +878,7 @@ class LyricTimeline(LayoutElement):
             self._is_flexible = is_flexible
         if element_id is not None:
             self._element_id = element_id
+        self._info = None
 
     @classmethod
     def from_lrc_file(cls, lrc_path: str, language: str = "unknown",
@@ -613,7 +889,9 @@ class LyricTimeline(LayoutElement):
                      is_flexible: bool = True) -> 'LyricTimeline':
         """从LRC文件创建时间轴"""
         lyrics_data = cls._parse_lrc_file(lrc_path)
-        return cls(lyrics_data, language, style, display_mode, element_id, priority, is_flexible)
+        # _parse_lrc_file的结果已按时间排序
+        return cls(lyrics_data, language, style, display_mode, element_id, priority, is_flexible,
+                   _sorted=True)
 
     @staticmethod
     def _parse_lrc_file(lrc_path: str) -> List[Tuple[float, str]]:
@@ -622,34 +900,40 @@ class LyricTimeline(LayoutElement):
         职责分离重构：
         - 只负责LRC格式解析，保留原始文本
         - 文本清理和预处理统一由_preprocess_lyrics()负责
+
+        整个文件只扫描一次：预编译的正则在字节缓冲区上finditer找出所有
+        歌词行，时间戳按标签数字的字节偏移向量化计算。
         """
-        lyrics_dict = {}  # 使用字典来收集相同时间点的歌词数组
-
-        with open(lrc_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        for line in lines:
-            line = line.strip()
-            time_match = re.match(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', line)
-            if time_match:
-                minutes = int(time_match.group(1))
-                seconds = int(time_match.group(2))
-                centiseconds = int(time_match.group(3))
-                text = time_match.group(4).strip()
-                timestamp = minutes * 60 + seconds + centiseconds / 100
-
-                if text:  # 只处理非空文本
-                    if timestamp in lyrics_dict:
-                        # 相同时间点的歌词添加到数组
-                        lyrics_dict[timestamp].append(text)
-                    else:
-                        lyrics_dict[timestamp] = [text]
-
-        # 转换为列表，保留原始文本，不进行清理（由_preprocess_lyrics统一处理）
+        with open(lrc_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []  # 空文件无法建立内存映射
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = []
+                texts = []
+                for match in _LRC_LINE_RE.finditer(mm):
+                    text = match.group(2).decode('utf-8').strip()
+                    if text:  # 只处理非空文本
+                        offsets.append(match.start(1))
+                        texts.append(text)
+
+                if not texts:
+                    return []
+
+                # 时间标签 MM:SS.CC 的数字位于起始偏移的 +0,+1 / +3,+4 / +6,+7 处
+                digits = np.frombuffer(mm, dtype=np.uint8)
+                pos = np.array(offsets, dtype=np.intp)
+                minutes = (digits[pos] - 48) * 10 + (digits[pos + 1] - 48)
+                seconds = (digits[pos + 3] - 48) * 10 + (digits[pos + 4] - 48)
+                centiseconds = (digits[pos + 6] - 48) * 10 + (digits[pos + 7] - 48)
+                del digits  # 释放对mmap缓冲区的引用，否则映射无法关闭
+
+        timestamps = (minutes.astype(np.int64) * 60 + seconds) + centiseconds / 100
+
+        # 稳定排序后相同时间点的歌词相邻且保持文件顺序，一次线性分组即可合并，无需浮点键哈希表
+        order = np.argsort(timestamps, kind='stable')
         lyrics = []
-        for timestamp, text_lines in lyrics_dict.items():
-            # 直接组合为字符串，保留原始内容
-            combined_text = '\n'.join(text_lines)
-            lyrics.append((timestamp, combined_text))
-
-        return sorted(lyrics, key=lambda x: x[0])
\ No newline at end of file
+        for timestamp, group in groupby(zip(timestamps[order].tolist(), order.tolist()), key=itemgetter(0)):
+            # 保留原始文本，不进行清理（由_preprocess_lyrics统一处理）
+            lyrics.append((timestamp, '\n'.join(texts[k] for _, k in group)))
+        return lyrics
\ No newline at end of file
@@ -8,25 +8,35 @@ LyricClip主程序 - 使用新的LyricClip实现渲染歌词视频
 
 import sys
 import time
+import logging
 import argparse
 from pathlib import Path
+from typing import Optional
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from enhanced_generator import EnhancedJingwuGenerator
-from lyric_timeline import LyricTimeline, LyricDisplayMode
-from layout_types import LyricStyle
-from lrc_mv_config import load_lrc_mv_config
+# 渲染相关模块（MoviePy、numpy、OpenCV、PIL等）在实际使用时才导入，
+# --help和参数错误等提前退出的路径不必承担这部分启动开销
+from video_encoders import DRAFT_ENCODERS, DEFAULT_DRAFT_ENCODER
+
+logger = logging.getLogger(__name__)
 
 
 class LyricClipRenderer:
     """LyricClip渲染器 - 使用新的统一渲染管道"""
 
-    def __init__(self, width: int = 720, height: int = 1280, fps: int = 30):
+    def __init__(self, width: int = 720, height: int = 1280, fps: int = 30, workers: Optional[int] = None,
+                 encoder: str = DEFAULT_DRAFT_ENCODER, draft_scale: float = 0.5):
         self.width = width
         self.height = height
         self.fps = fps
-        self.generator = EnhancedJingwuGenerator(width, height, fps)
+        # 草稿模式的渲染缩放比例：按缩小后的尺寸合成帧，编码时由ffmpeg放大回输出尺寸
+        if not 0 < draft_scale <= 1:
+            raise ValueError(f"草稿缩放比例必须在(0, 1]范围内: {draft_scale}")
+        self.draft_scale = draft_scale
+
+        from enhanced_generator import EnhancedJingwuGenerator
+        self.generator = EnhancedJingwuGenerator(width, height, fps, workers=workers, encoder=encoder)
 
     def render_from_config(self, config_path: Path,
                           t_max_sec: float = float('inf'),
@@ -42,78 +52,99 @@ class LyricClipRenderer:
         Returns:
             渲染是否成功
         """
-        print("🎬 LyricClip渲染器")
-        print("=" * 60)
-        print(f"质量模式: {'草稿' if draft_mode else '产品'}")
-        print(f"时长限制: {t_max_sec if t_max_sec != float('inf') else '无限制'}")
-        print()
+        logger.info("🎬 LyricClip渲染器")
+        logger.info("=" * 60)
+        logger.info("质量模式: %s", '草稿' if draft_mode else '产品')
+        logger.info("时长限制: %s", t_max_sec if t_max_sec != float('inf') else '无限制')
+        logger.info("")
 
         try:
             # 加载配置
-            print(f"📁 加载配置文件: {config_path}")
+            from lrc_mv_config import load_lrc_mv_config
+            logger.info("📁 加载配置文件: %s", config_path)
             config = load_lrc_mv_config(str(config_path))
-            print("✅ 配置文件加载成功")
+            logger.info("✅ 配置文件加载成功")
 
             # 显示配置信息
             self._print_config_info(config)
 
             # 验证文件
-            print("\n🔍 验证文件存在性...")
+            logger.info("")
+            logger.info("🔍 验证文件存在性...")
             config.validate_files()
-            print("✅ 所有必需文件都存在")
+            logger.info("✅ 所有必需文件都存在")
 
             # 获取路径
             audio_path = config.get_audio_path()
             background_path = config.get_background_path()
             output_path = config.get_output_path()
 
-            # 创建时间轴
-            print("\n⏱️ 创建歌词时间轴...")
-            timelines = self._create_timelines(config)
+            # 草稿模式按缩小的尺寸渲染（像素数按比例平方减少），输出尺寸保持不变
+            scale = self.draft_scale if draft_mode else 1.0
+            self._apply_render_scale(scale)
 
-            # 计算音频时长
-            from moviepy import AudioFileClip
-            with AudioFileClip(str(audio_path)) as audio:
-                audio_duration = min(audio.duration, t_max_sec)
-            print(f"音频时长: {audio_duration:.2f}秒")
+            # 创建时间轴
+            logger.info("")
+            logger.info("⏱️ 创建歌词时间轴...")
+            timelines = self._create_timelines(config, font_scale=scale)
 
-            # 选择渲染方式
-            
+            # 音频只由生成器打开一次：时长在那里读取，并按t_max_sec截断
             success = self._render(
                 timelines, audio_path, background_path, output_path,
-                audio_duration, draft_mode
+                t_max_sec, draft_mode
             )
 
             if success:
                 self._print_success_info(output_path)
             else:
-                print("\n❌ 视频渲染失败！")
+                logger.error("")
+                logger.error("❌ 视频渲染失败！")
 
             return success
 
         except Exception as e:
-            print(f"\n❌ 渲染过程出错: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("")
+            logger.exception("❌ 渲染过程出错: %s", e)
             return False
 
     def _print_config_info(self, config):
         """打印配置信息"""
-        print(f"   🎵 音频文件: {config.audio}")
-        print(f"   📝 主歌词: {config.main_lrc.path} ({config.main_lrc.lang})")
+        logger.info("   🎵 音频文件: %s", config.audio)
+        logger.info("   📝 主歌词: %s (%s)", config.main_lrc.path, config.main_lrc.lang)
         if config.aux_lrc:
-            print(f"   📝 副歌词: {config.aux_lrc.path} ({config.aux_lrc.lang})")
-        print(f"   🖼️ 背景图片: {config.background}")
-        print(f"   📐 输出尺寸: {config.width}x{config.height}")
-        print(f"   📄 输出文件: {config.output}")
+            logger.info("   📝 副歌词: %s (%s)", config.aux_lrc.path, config.aux_lrc.lang)
+        logger.info("   🖼️ 背景图片: %s", config.background)
+        logger.info("   📐 输出尺寸: %dx%d", config.width, config.height)
+        logger.info("   📄 输出文件: %s", config.output)
+
+    def _apply_render_scale(self, scale: float):
+        """设置生成器的渲染尺寸（按比例缩放，保持偶数）和输出尺寸"""
+        if scale == 1.0:
+            self.generator.width, self.generator.height = self.width, self.height
+            self.generator.output_size = None
+            return
+
+        self.generator.width = max(2, int(self.width * scale) // 2 * 2)
+        self.generator.height = max(2, int(self.height * scale) // 2 * 2)
+        self.generator.output_size = (self.width, self.height)
+        logger.info("渲染尺寸: %dx%d (编码时放大到 %dx%d)", self.generator.width,
+                    self.generator.height, self.width, self.height)
+
+    def _create_timelines(self, config, font_scale: float = 1.0):
+        """创建歌词时间轴
+
+        Args:
+            config: 歌词MV配置
+            font_scale: 字体大小缩放比例（与渲染尺寸的缩放一致）
+        """
+        from lyric_timeline import LyricTimeline, LyricDisplayMode
+        from layout_types import LyricStyle
 
-    def _create_timelines(self, config):
-        """创建歌词时间轴"""
         timelines = []
 
         # 创建主时间轴
         main_lrc_path = config.get_main_lrc_path()
-        main_font_size = config.main_lrc.font_size or 80
+        main_font_size = max(1, round((config.main_lrc.font_size or 80) * font_scale))
 
         main_style = LyricStyle(
             font_size=main_font_size,
@@ -130,12 +161,12 @@ class LyricClipRenderer:
             priority=1
         )
         timelines.append(main_timeline)
-        print(f"   ✅ 主时间轴: {len(main_timeline.lyrics_data)} 句歌词")
+        logger.info("   ✅ 主时间轴: %d 句歌词", len(main_timeline.lyrics_data))
 
         # 创建副时间轴（如果存在）
         if config.aux_lrc:
             aux_lrc_path = config.get_aux_lrc_path()
-            aux_font_size = config.aux_lrc.font_size or 60
+            aux_font_size = max(1, round((config.aux_lrc.font_size or 60) * font_scale))
 
             aux_style = LyricStyle(
                 font_size=aux_font_size,
@@ -152,14 +183,15 @@ class LyricClipRenderer:
                 priority=2
             )
             timelines.append(aux_timeline)
-            print(f"   ✅ 副时间轴: {len(aux_timeline.lyrics_data)} 句歌词")
+            logger.info("   ✅ 副时间轴: %d 句歌词", len(aux_timeline.lyrics_data))
 
         return timelines
 
     def _render(self, timelines, audio_path, background_path,
-                                      output_path, duration, draft_mode):
+                                      output_path, t_max_sec, draft_mode):
         """使用传统方法渲染（对比用）"""
-        print("\n🐌 使用传统方法渲染（对比）...")
+        logger.info("")
+        logger.info("🐌 使用传统方法渲染（对比）...")
 
         start_time = time.perf_counter()
 
@@ -174,35 +206,48 @@ class LyricClipRenderer:
                 audio_path=str(audio_path),
                 output_path=str(output_path),
                 background_image=str(background_path),
-                t_max_sec=duration,
+                t_max_sec=t_max_sec,
                 draft_mode=draft_mode
             )
 
             render_time = time.perf_counter() - start_time
             if success:
-                print(f"✅ 传统方法渲染完成，耗时: {render_time:.2f}秒")
+                logger.info("✅ 传统方法渲染完成，耗时: %.2f秒", render_time)
             else:
-                print(f"❌ 传统方法渲染失败，耗时: {render_time:.2f}秒")
+                logger.error("❌ 传统方法渲染失败，耗时: %.2f秒", render_time)
 
             return success
 
         except Exception as e:
             render_time = time.perf_counter() - start_time
-            print(f"❌ 传统方法渲染失败: {e}")
-            print(f"失败前耗时: {render_time:.2f}秒")
+            logger.error("❌ 传统方法渲染失败: %s", e)
+            logger.error("失败前耗时: %.2f秒", render_time)
             return False
 
     def _print_success_info(self, output_path):
         """打印成功信息"""
-        print("\n🎉 视频渲染成功！")
-        print(f"📄 输出文件: {output_path}")
+        logger.info("")
+        logger.info("🎉 视频渲染成功！")
+        logger.info("📄 输出文件: %s", output_path)
 
         if output_path.exists():
             file_size = output_path.stat().st_size / (1024 * 1024)  # MB
-            print(f"📊 文件大小: {file_size:.1f} MB")
+            logger.info("📊 文件大小: %.1f MB", file_size)
+
+        logger.info("")
+        logger.info("🔍 可以使用以下命令查看结果:")
+        logger.info("   播放视频: start %s", output_path)
 
-        print("\n🔍 可以使用以下命令查看结果:")
-        print(f"   播放视频: start {output_path}")
+
+def _draft_scale(value: str) -> float:
+    """解析--draft-scale参数，取值范围(0, 1]"""
+    try:
+        scale = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的缩放比例: {value}")
+    if not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError(f"缩放比例必须在(0, 1]范围内: {value}")
+    return scale
 
 
 def main():
@@ -260,16 +305,41 @@ def main():
         help="帧率 (默认: 24)"
     )
 
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=None,
+        help="渲染帧的工作进程数 (默认: CPU核心数，1表示单进程)"
+    )
+
+    parser.add_argument(
+        "--encoder",
+        choices=sorted(DRAFT_ENCODERS),
+        default=DEFAULT_DRAFT_ENCODER,
+        help=f"草稿模式的视频编码器，不可用时回退到x264 (默认: {DEFAULT_DRAFT_ENCODER})"
+    )
+
+    parser.add_argument(
+        "--draft-scale",
+        type=_draft_scale,
+        default=0.5,
+        help="草稿模式的渲染缩放比例，编码时放大回输出尺寸 (默认: 0.5，1表示按原尺寸渲染)"
+    )
+
     args = parser.parse_args()
 
+    # 进度信息经logging输出（渲染模块的logger同样可见）
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO, format="%(message)s")
+
     # 检查配置文件
     if not args.config.exists():
-        print(f"❌ 配置文件不存在: {args.config}")
-        print("请确保配置文件路径正确，或使用 --config 参数指定")
+        logger.error("❌ 配置文件不存在: %s", args.config)
+        logger.error("请确保配置文件路径正确，或使用 --config 参数指定")
         return 1
 
     # 创建渲染器
-    renderer = LyricClipRenderer(args.width, args.height, args.fps)
+    renderer = LyricClipRenderer(args.width, args.height, args.fps, workers=args.workers,
+                                 encoder=args.encoder, draft_scale=args.draft_scale)
 
     # 开始渲染
     success = renderer.render_from_config(
@@ -6,10 +6,117 @@
 import cProfile
 import pstats
 import io
+import json
+import shutil
+import subprocess
+import sys
+from collections import Counter
 from pathlib import Path
 
-def profile_current_version():
-    """分析当前版本的性能"""
+# 被分析的渲染任务（py-spy以子进程方式运行）
+PROFILE_CODE = (
+    "from pathlib import Path; "
+    "from enhanced_generator import render_mv_by_config; "
+    "render_mv_by_config(config_path=Path('精武英雄/lrc-mv.yaml'), t_max_sec=60.0, out_suffix='.perf')"
+)
+SPEEDSCOPE_PATH = 'perf.speedscope.json'
+# 报告中单独汇总的关键瓶颈（按函数名或文件路径匹配）
+KEY_PATTERNS = ('PIL', 'compose', 'get_frame')
+
+
+def profile_current_version(deep: bool = False):
+    """分析当前版本的性能
+
+    默认使用py-spy采样分析（开销约1%，包含多进程渲染的工作进程和C扩展中的调用栈）；
+    未安装py-spy或指定deep时使用cProfile插桩分析
+    """
+    if not deep and shutil.which('py-spy'):
+        profile_with_py_spy()
+    else:
+        if not deep:
+            print("⚠️  未找到py-spy，改用cProfile（插桩开销较大，且看不到工作进程）")
+        profile_with_cprofile()
+
+
+def profile_with_py_spy():
+    """使用py-spy采样分析渲染过程，并按函数汇总采样结果"""
+    print("🔍 使用py-spy采样分析性能瓶颈...")
+
+    cmd = [
+        'py-spy', 'record', '-r', '250', '--native', '--subprocesses',
+        '-f', 'speedscope', '-o', SPEEDSCOPE_PATH,
+        '--', sys.executable, '-c', PROFILE_CODE
+    ]
+    result = subprocess.run(cmd)
+    if result.returncode != 0 or not Path(SPEEDSCOPE_PATH).exists():
+        print(f"❌ py-spy分析失败 (返回码 {result.returncode})")
+        return
+
+    with open(SPEEDSCOPE_PATH, 'r', encoding='utf-8') as f:
+        speedscope = json.load(f)
+
+    # 汇总所有进程的采样：自身耗时按栈顶函数计，累计耗时按栈中出现的函数计
+    frames = speedscope['shared']['frames']
+    names = [f"{frame['name']} ({frame.get('file', '?')}:{frame.get('line', '?')})" for frame in frames]
+    self_counts = Counter()
+    total_counts = Counter()
+    total_samples = 0
+    for profile in speedscope['profiles']:
+        for stack, weight in zip(profile['samples'], profile['weights']):
+            if not stack:
+                continue
+            total_samples += weight
+            self_counts[stack[-1]] += weight
+            for frame_index in set(stack):
+                total_counts[frame_index] += weight
+
+    def format_counts(counts: Counter, limit: int) -> str:
+        lines = []
+        for frame_index, count in counts.most_common(limit):
+            lines.append(f"{count / total_samples:7.1%}  {names[frame_index]}")
+        return "\n".join(lines)
+
+    print("\n📊 性能分析结果:")
+    print("=" * 60)
+    self_output = format_counts(self_counts, 20)
+    total_output = format_counts(total_counts, 20)
+    print("自身耗时前20:")
+    print(self_output)
+    print("\n累计耗时前20:")
+    print(total_output)
+
+    # 查找特定的瓶颈
+    print("\n🔍 查找关键瓶颈:")
+    print("-" * 40)
+    key_outputs = {}
+    for pattern in KEY_PATTERNS:
+        matched = Counter({i: c for i, c in total_counts.items() if pattern in names[i]})
+        key_outputs[pattern] = format_counts(matched, 10)
+        if matched:
+            print(f"\n{pattern}相关调用:")
+            print(key_outputs[pattern])
+        else:
+            print(f"未发现{pattern}相关瓶颈")
+
+    # 保存详细报告
+    with open('current_performance_analysis.txt', 'w', encoding='utf-8') as f:
+        f.write("py-spy 采样性能分析报告\n")
+        f.write("=" * 50 + "\n\n")
+        f.write(f"采样总数: {total_samples}\n\n")
+        f.write("自身耗时:\n")
+        f.write(self_output)
+        f.write("\n\n累计耗时:\n")
+        f.write(total_output)
+        for pattern, output in key_outputs.items():
+            f.write(f"\n\n{pattern}相关:\n")
+            f.write(output)
+
+    print("\n📄 详细报告已保存到: current_performance_analysis.txt")
+    print(f"📄 火焰图数据: {SPEEDSCOPE_PATH}（可在 https://www.speedscope.app 打开）")
+
+
+def profile_with_cprofile():
+    """使用cProfile分析当前版本的性能（插桩分析，只统计主进程）"""
     print("🔍 分析MoviePy 2.1.2性能瓶颈...")
     
     # 创建性能分析器
@@ -111,7 +218,7 @@ def profile_current_version():
         f.write("\n\nget_frame相关:\n")
         f.write(frame_output)
     
-    print(f"\n📄 详细报告已保存到: current_performance_analysis.txt")
+    print("\n📄 详细报告已保存到: current_performance_analysis.txt")
 
 # def compare_with_old_analysis():
 #     """对比旧的性能分析"""
@@ -138,6 +245,12 @@ def profile_current_version():
 
 def main():
     """主函数"""
+    import argparse
+    parser = argparse.ArgumentParser(description="渲染性能分析")
+    parser.add_argument("--deep", action="store_true",
+                        help="使用cProfile插桩分析（默认使用py-spy采样）")
+    args = parser.parse_args()
+
     print("🚀 MoviePy 2.1.2 性能重新分析")
     print("=" * 60)
     
@@ -150,7 +263,7 @@ def main():
         return
     
     # 运行性能分析
-    profile_current_version()
+    profile_current_version(deep=args.deep)
     
     # 对比旧分析
     # compare_with_old_analysis()
@@ -0,0 +1,16 @@
+"""
+视频编码器配置
+
+草稿模式可选的编码器表。不依赖MoviePy等重量级模块，命令行解析时即可导入
+"""
+
+# 草稿模式可选的编码器：名称 -> (ffmpeg编码器, 预设, 默认参数)
+# 硬件编码器不可用时回退到x264软件编码
+DRAFT_ENCODERS = {
+    # 显式-threads 0：libx264按CPU核心数开启帧级多线程（ultrafast已关闭lookahead）
+    'x264': ('libx264rgb', 'ultrafast', ['-crf', '28', '-threads', '0']),
+    'nvenc': ('h264_nvenc', 'p1', ['-rc', 'vbr', '-cq', '28']),
+    'qsv': ('h264_qsv', 'veryfast', ['-global_quality', '28']),
+    'vt': ('h264_videotoolbox', 'fast', ['-b:v', '6M']),
+}
+DEFAULT_DRAFT_ENCODER = 'nvenc'